@@ -14,6 +14,19 @@ class Settings(BaseSettings):
     # Recipients (comma-separated emails in env)
     RECIPIENT_EMAILS: str  # Will be parsed into list
     
+    # Recipient Routing (JSON rules file, re-read when it changes)
+    ROUTING_RULES_FILE: Optional[str] = None
+    ROUTING_RELOAD_INTERVAL: float = 5.0  # Seconds between file change checks
+    
+    # Tenants (JSON profiles file, selected by /tenants/{id} prefix or header)
+    TENANTS_FILE: Optional[str] = None
+    TENANT_HEADER: str = "X-Tenant-ID"
+    TENANT_CLIENT_CACHE_SIZE: int = 32  # Brevo API clients kept open
+    
+    # Graceful Shutdown
+    LIFECYCLE_STATE_FILE: str = "lifecycle_state.json"  # Unsent work saved on shutdown
+    SHUTDOWN_DRAIN_TIMEOUT: float = 10.0  # Seconds to wait for in-flight sends
+    
     # Webhook Security
     WEBHOOK_SECRET: Optional[str] = None
     
@@ -26,8 +39,8 @@ class Settings(BaseSettings):
         case_sensitive = False
     
     def get_recipient_list(self) -> List[str]:
-        """Parse comma-separated recipient emails into list."""
-        return [email.strip() for email in self.RECIPIENT_EMAILS.split(",")]
+        """Parse comma-separated recipient emails into list, skipping empty entries."""
+        return [email.strip() for email in self.RECIPIENT_EMAILS.split(",") if email.strip()]
 
 
 # Create a global settings instance
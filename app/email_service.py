@@ -1,10 +1,13 @@
+import asyncio
+import itertools
 import sib_api_v3_sdk
 from sib_api_v3_sdk.rest import ApiException
 import logging
-from typing import List
+from typing import List, Dict, Any, Optional, Tuple
 
-from app.config import settings
-from app.models import LeadRequest
+from app.lifecycle import lifecycle
+from app.models import LeadRequest, TenantProfile
+from app.tenants import tenant_registry
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -15,23 +18,32 @@ class EmailService:
     """Service for sending emails via Brevo API using official SDK."""
     
     def __init__(self):
-        # Configure API key authorization
-        configuration = sib_api_v3_sdk.Configuration()
-        configuration.api_key['api-key'] = settings.BREVO_API_KEY
-        
-        self.api_instance = sib_api_v3_sdk.TransactionalEmailsApi(sib_api_v3_sdk.ApiClient(configuration))
-        self.sender_email = settings.BREVO_SENDER_EMAIL
-        self.sender_name = settings.BREVO_SENDER_NAME
-        self.recipient_emails = settings.get_recipient_list()
+        # Sends in progress and restored sends waiting their turn, saved on shutdown
+        self._pending: Dict[int, Tuple[Dict[str, Any], asyncio.Future]] = {}
+        self._backlog: List[Dict[str, Any]] = []
+        # Restored sends that failed again, kept for the next start
+        self._failed: List[Dict[str, Any]] = []
+        self._send_ids = itertools.count()
     
-    async def send_lead_notification(self, lead: LeadRequest, firstname: str = None, lastname: str = None) -> dict:
+    async def send_lead_notification(
+        self,
+        lead: LeadRequest,
+        firstname: str = None,
+        lastname: str = None,
+        attributes: Optional[Dict[str, Any]] = None,
+        tenant: Optional[TenantProfile] = None
+    ) -> dict:
         """
         Send lead notification email to multiple recipients using Brevo SDK.
         
+        Recipients are resolved by the tenant's routing rules, falling back to its recipients.
+        
         Args:
             lead: Lead information
             firstname: Contact's first name (optional)
             lastname: Contact's last name (optional)
+            attributes: Brevo contact attributes used for routing (optional)
+            tenant: Sender profile (optional, defaults to the default tenant)
             
         Returns:
             dict: Response containing success status and message
@@ -40,53 +52,58 @@ class EmailService:
             # Use firstname if provided, otherwise use lead.name
             display_name = firstname if firstname else lead.name
             
+            tenant = tenant or tenant_registry.get()
+            
             # Create HTML email body
-            html_body = f"""
-            <html>
-                <body style="font-family: Arial, sans-serif; line-height: 1.8; color: #333; max-width: 600px; margin: 0 auto; padding: 20px;">
-                    <h2 style="color: #2c3e50; font-size: 24px; margin-bottom: 20px;">Greetings!</h2>
-                    
-                    <p style="font-size: 16px; margin-bottom: 20px;">
-                        A new contact has been registered in the BPO <span style="background-color: #c8e6c9; padding: 2px 4px;">Acceptor</span> website. Below are the details:
-                    </p>
-                    
-                    <div style="background-color: #f8f9fa; padding: 20px; border-radius: 5px; margin: 20px 0;">
-                        <p style="margin: 10px 0; font-size: 16px;"><strong>Name :</strong> {display_name}</p>
-                        <p style="margin: 10px 0; font-size: 16px;"><strong>Email Address :</strong> {lead.email}</p>
-                        <p style="margin: 10px 0; font-size: 16px;"><strong>Message :</strong> {lead.message}</p>
-                    </div>
-                    
-                    <div style="margin-top: 30px; font-size: 16px;">
-                        <p style="margin: 5px 0;">Best Regards,</p>
-                        <p style="margin: 5px 0; font-weight: bold;">Rachel Roy</p>
-                        <p style="margin: 5px 0;">Business Development Executive</p>
-                        <p style="margin: 5px 0;"><a href="http://www.bpoacceptor.com" style="color: #2c3e50; text-decoration: none;">www.bpoacceptor.com</a></p>
-                    </div>
-                </body>
-            </html>
-            """
+            html_body = tenant_registry.get_template(tenant).safe_substitute(
+                display_name=display_name,
+                email=lead.email,
+                message=lead.message,
+                sender_name=tenant.sender_name,
+                sender_email=tenant.sender_email
+            )
             
             # Prepare sender
             sender = sib_api_v3_sdk.SendSmtpEmailSender(
-                name=self.sender_name,
-                email=self.sender_email
+                name=tenant.sender_name,
+                email=tenant.sender_email
             )
             
             # Prepare recipients
-            to = [sib_api_v3_sdk.SendSmtpEmailTo(email=email) for email in self.recipient_emails]
+            recipient_emails = tenant_registry.resolve_recipients(tenant, lead, attributes)
+            to = [sib_api_v3_sdk.SendSmtpEmailTo(email=email) for email in recipient_emails]
             
             # Create email object
             send_smtp_email = sib_api_v3_sdk.SendSmtpEmail(
                 sender=sender,
                 to=to,
-                subject="New Contact Registration - BPO Acceptor",
+                subject=tenant.subject,
                 html_content=html_body
             )
             
             # Send email
-            logger.info(f"Sending lead notification to {len(self.recipient_emails)} recipients via Brevo SDK")
+            logger.info(f"Sending lead notification for tenant {tenant.id} to {len(recipient_emails)} recipients via Brevo SDK")
+            
+            # Run the blocking SDK call in a thread so shutdown can drain it
+            future = asyncio.get_running_loop().run_in_executor(
+                None, tenant_registry.get_api(tenant).send_transac_email, send_smtp_email
+            )
+            lifecycle.track(future)
+            send_id = next(self._send_ids)
+            self._pending[send_id] = (
+                {
+                    "lead": lead.model_dump(),
+                    "firstname": firstname,
+                    "lastname": lastname,
+                    "attributes": attributes,
+                    "tenant": tenant.id
+                },
+                future
+            )
+            future.add_done_callback(lambda _: self._pending.pop(send_id, None))
             
-            api_response = self.api_instance.send_transac_email(send_smtp_email)
+            # Shield so a cancelled request leaves the send to finish or be saved
+            api_response = await asyncio.shield(future)
             
             logger.info("Lead notification sent successfully via Brevo SDK")
             logger.info(f"Brevo message ID: {api_response.message_id}")
@@ -109,6 +126,50 @@ class EmailService:
                 "message": f"Error processing lead: {str(e)}"
             }
 
+    
+    def flush_pending(self) -> List[Dict[str, Any]]:
+        """Return sends that have not completed, to be saved on shutdown."""
+        unfinished = [job for job, future in self._pending.values() if not future.done()]
+        unfinished.extend(self._backlog)
+        unfinished.extend(self._failed)
+        self._backlog = []
+        self._failed = []
+        return unfinished
+    
+    def restore_pending(self, jobs: List[Dict[str, Any]]):
+        """Queue sends saved by the previous shutdown and resend them in the background."""
+        self._backlog.extend(jobs)
+        lifecycle.track(asyncio.get_running_loop().create_task(self._send_backlog()))
+    
+    async def _send_backlog(self):
+        """Resend restored lead notifications until the backlog is empty or shutdown starts."""
+        while self._backlog and lifecycle.accepting:
+            job = self._backlog.pop(0)
+            try:
+                lead = LeadRequest(**job["lead"])
+            except Exception as e:
+                logger.error(f"Dropping invalid saved lead notification {job!r}: {str(e)}")
+                continue
+            
+            tenant = tenant_registry.get(job.get("tenant"))
+            if tenant is None:
+                logger.error(f"Keeping saved lead notification for unknown tenant: {job.get('tenant')}")
+                self._failed.append(job)
+                continue
+            
+            result = await self.send_lead_notification(
+                lead,
+                job.get("firstname"),
+                job.get("lastname"),
+                job.get("attributes"),
+                tenant
+            )
+            if not result["success"]:
+                # No client is waiting for this send, so keep it for the next start
+                logger.error(f"Failed to resend lead notification for {lead.email}, keeping it: {result['message']}")
+                self._failed.append(job)
+
 
 # Create a global email service instance
 email_service = EmailService()
+lifecycle.register("lead_notifications", email_service.flush_pending, email_service.restore_pending)
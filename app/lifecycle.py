@@ -0,0 +1,188 @@
+import asyncio
+import json
+import logging
+import os
+import signal
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from app.config import settings
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+FlushHook = Callable[[], List[Dict[str, Any]]]
+RestoreHook = Callable[[List[Dict[str, Any]]], None]
+
+
+class Lifecycle:
+    """
+    Application startup and graceful shutdown.
+
+    Components register hooks by name: on shutdown each flush hook returns the
+    work it could not finish, which is written to the state file; on startup
+    the saved items are handed back to the matching restore hook.
+    """
+
+    def __init__(self, state_file: str, drain_timeout: float = 10.0):
+        self.state_file = state_file
+        self.drain_timeout = drain_timeout
+        self.accepting = True
+        self._in_flight: Set[asyncio.Future] = set()
+        self._flush_hooks: Dict[str, FlushHook] = {}
+        self._restore_hooks: Dict[str, RestoreHook] = {}
+        # Saved items that could not be restored, written back on shutdown
+        self._unrestored: Dict[str, List[Dict[str, Any]]] = {}
+        self._previous_handlers: Dict[int, Any] = {}
+
+    def register(self, name: str, flush: Optional[FlushHook] = None, restore: Optional[RestoreHook] = None):
+        """Register flush and restore hooks for a component."""
+        if flush is not None:
+            self._flush_hooks[name] = flush
+        if restore is not None:
+            self._restore_hooks[name] = restore
+
+    def track(self, future: asyncio.Future) -> asyncio.Future:
+        """Track a future or task as in-flight work to drain on shutdown."""
+        self._in_flight.add(future)
+        future.add_done_callback(self._in_flight.discard)
+        return future
+
+    def install_signal_handlers(self):
+        """
+        Stop accepting work as soon as SIGTERM or SIGINT arrives.
+
+        The server only runs the shutdown hook after it has closed its sockets and
+        waited for open requests, so the flag is set here and the signal is then
+        passed on to the server's own handler.
+        """
+        if threading.current_thread() is not threading.main_thread():
+            return
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            self._previous_handlers[sig] = signal.signal(sig, self._handle_signal)
+
+    def restore_signal_handlers(self):
+        """Put back the signal handlers replaced by install_signal_handlers."""
+        for sig, handler in self._previous_handlers.items():
+            signal.signal(sig, handler)
+        self._previous_handlers = {}
+
+    def _handle_signal(self, sig: int, frame):
+        """Reject new work, then hand the signal to the previous handler."""
+        if self.accepting:
+            logger.info(f"Received {signal.Signals(sig).name}, no longer accepting work")
+        self.accepting = False
+
+        previous = self._previous_handlers.get(sig)
+        if callable(previous):
+            previous(sig, frame)
+        elif previous == signal.SIG_DFL:
+            signal.signal(sig, signal.SIG_DFL)
+            signal.raise_signal(sig)
+
+    async def startup(self) -> Dict[str, int]:
+        """
+        Restore work saved by the previous shutdown.
+
+        Returns:
+            dict: Number of items restored per component
+        """
+        self.accepting = True
+        try:
+            with open(self.state_file, encoding="utf-8") as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to read lifecycle state from {self.state_file}: {str(e)}")
+            return {}
+
+        restored = {}
+        remaining = {}
+        for name, items in state.get("components", {}).items():
+            restore = self._restore_hooks.get(name)
+            if restore is None:
+                logger.warning(f"No restore hook for {name}, keeping its saved items")
+                remaining[name] = items
+                continue
+            try:
+                restore(items)
+            except Exception as e:
+                logger.error(f"Failed to restore {name}, keeping its saved items: {str(e)}")
+                remaining[name] = items
+                continue
+            restored[name] = len(items)
+        self._unrestored = remaining
+
+        # Restored work now belongs to the components; don't restore it twice
+        try:
+            if remaining:
+                self._write_state({"saved_at": state.get("saved_at"), "components": remaining})
+            else:
+                os.remove(self.state_file)
+        except OSError as e:
+            logger.error(f"Failed to update lifecycle state in {self.state_file}: {str(e)}")
+        logger.info(f"Warm start restored: {restored}")
+        return restored
+
+    async def shutdown(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Stop accepting work, drain in-flight work and save what is left.
+
+        Args:
+            timeout: Seconds to wait for in-flight work (defaults to drain_timeout)
+
+        Returns:
+            dict: Shutdown report with drained, unfinished and flushed counts
+        """
+        started = time.monotonic()
+        self.accepting = False
+        timeout = self.drain_timeout if timeout is None else timeout
+
+        in_flight = set(self._in_flight)
+        unfinished = set()
+        if in_flight:
+            logger.info(f"Draining {len(in_flight)} in-flight tasks (timeout {timeout}s)")
+            _, unfinished = await asyncio.wait(in_flight, timeout=timeout)
+
+        flushed = {}
+        components = {name: list(items) for name, items in self._unrestored.items()}
+        for name, flush in self._flush_hooks.items():
+            try:
+                items = flush()
+            except Exception as e:
+                logger.error(f"Failed to flush {name}: {str(e)}")
+                continue
+            flushed[name] = len(items)
+            if items:
+                components.setdefault(name, []).extend(items)
+
+        if components:
+            try:
+                self._write_state({"saved_at": time.time(), "components": components})
+            except OSError as e:
+                logger.error(f"Failed to write lifecycle state to {self.state_file}: {str(e)}")
+
+        report = {
+            "drained": len(in_flight) - len(unfinished),
+            "unfinished": len(unfinished),
+            "flushed": flushed,
+            "elapsed": round(time.monotonic() - started, 3)
+        }
+        logger.info(f"Shutdown complete: {report}")
+        return report
+
+    def _write_state(self, state: Dict[str, Any]):
+        """Write the state file atomically so a crash can't leave it half written."""
+        tmp_file = f"{self.state_file}.tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.state_file)
+
+
+# Create a global lifecycle instance
+lifecycle = Lifecycle(settings.LIFECYCLE_STATE_FILE, settings.SHUTDOWN_DRAIN_TIMEOUT)
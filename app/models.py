@@ -1,5 +1,6 @@
-from pydantic import BaseModel, EmailStr, Field
-from typing import Optional, Dict, Any, List
+from pydantic import BaseModel, EmailStr, Field, field_validator
+import re
+from typing import Optional, Dict, Any, List, Literal
 from datetime import datetime
 
 
@@ -20,6 +21,72 @@ class LeadRequest(BaseModel):
         }
 
 
+class RoutingRule(BaseModel):
+    """Recipient routing rule loaded from the routing rules file."""
+    
+    name: str = Field(..., min_length=1, description="Rule name used in logs")
+    keywords: List[str] = Field(default_factory=list, description="Match if the message contains any keyword")
+    domains: List[str] = Field(default_factory=list, description="Match if the sender email is in any domain")
+    attributes: Dict[str, Any] = Field(default_factory=dict, description="Match if all contact attributes are equal")
+    recipients: List[EmailStr] = Field(..., min_length=1, description="Recipients for matching leads")
+    strategy: Literal["all", "round_robin"] = Field("all", description="Send to all recipients or rotate one per lead")
+    
+    @field_validator("keywords")
+    @classmethod
+    def check_keywords(cls, keywords: List[str]) -> List[str]:
+        """Reject keywords that would lose characters when split into words."""
+        for keyword in keywords:
+            if not re.fullmatch(r"[\w\s-]*\w[\w\s-]*", keyword):
+                raise ValueError(
+                    f"Keyword {keyword!r} may only contain letters, digits, underscores, spaces and hyphens"
+                )
+        return keywords
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "name": "enterprise-us",
+                "keywords": ["call center", "enterprise"],
+                "domains": ["acme.com"],
+                "attributes": {"COUNTRY": "US"},
+                "recipients": ["rep1@example.com", "rep2@example.com"],
+                "strategy": "round_robin"
+            }
+        }
+
+
+class RoutingRuleSet(BaseModel):
+    """Contents of the routing rules file."""
+    
+    rules: List[RoutingRule] = Field(default_factory=list, description="Rules in evaluation order")
+
+
+class TenantProfile(BaseModel):
+    """Sender profile for one brand or site, loaded from the tenants file."""
+    
+    id: str = Field(..., min_length=1, pattern=r"^[A-Za-z0-9_-]+$", description="Tenant ID used in route prefix or header")
+    api_key: str = Field(..., min_length=1, description="Brevo API key")
+    sender_email: EmailStr = Field(..., description="Verified sender email")
+    sender_name: str = Field(..., min_length=1, description="Sender name")
+    recipients: List[EmailStr] = Field(..., min_length=1, description="Default lead recipients")
+    subject: str = Field("New Contact Registration", description="Lead notification subject")
+    template_file: Optional[str] = Field(None, description="HTML template with ${display_name}, ${email}, ${message}, ${sender_name} and ${sender_email}")
+    routing_rules_file: Optional[str] = Field(None, description="Recipient routing rules file")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "id": "acme",
+                "api_key": "xkeysib-...",
+                "sender_email": "leads@acme.com",
+                "sender_name": "Acme",
+                "recipients": ["sales@acme.com"],
+                "subject": "New Contact Registration - Acme",
+                "template_file": "templates/acme.html"
+            }
+        }
+
+
 class LeadResponse(BaseModel):
     """Lead submission response."""
     success: bool
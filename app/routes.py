@@ -1,15 +1,53 @@
-from fastapi import APIRouter, HTTPException, Request
-from app.models import LeadRequest, LeadResponse, BrevoWebhookEvent, WebhookResponse, BrevoContactWebhook
+from fastapi import APIRouter, Depends, Header, HTTPException, Path, Request
+from app.config import settings
+from app.models import LeadRequest, LeadResponse, BrevoWebhookEvent, WebhookResponse, BrevoContactWebhook, TenantProfile
 from app.email_service import email_service
+from app.lifecycle import lifecycle
+from app.tenants import tenant_registry
 from app.webhook_handler import webhook_handler
 import logging
+from typing import Optional
 
 router = APIRouter()
+# Lead routes that send for a tenant, also mounted under /tenants/{tenant_id}
+tenant_router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
-@router.post("/bpo-acceptor-lead", response_model=LeadResponse)
-async def submit_lead(lead: LeadRequest):
+def _ensure_accepting():
+    """Reject new work with 503 once shutdown has started, so clients and Brevo retry."""
+    if not lifecycle.accepting:
+        raise HTTPException(status_code=503, detail="Service is shutting down")
+
+
+def tenant_path(
+    request: Request,
+    tenant_id: str = Path(..., pattern=r"^[A-Za-z0-9_-]+$", description="Tenant ID")
+) -> str:
+    """Document and validate the tenant ID of routes mounted under /tenants/{tenant_id}."""
+    request.state.tenant_id = tenant_id
+    return tenant_id
+
+
+def get_tenant(
+    request: Request,
+    tenant_header: Optional[str] = Header(
+        None,
+        alias=settings.TENANT_HEADER,
+        description="Tenant ID, used when the route has no /tenants/{tenant_id} prefix"
+    )
+) -> TenantProfile:
+    """Resolve the tenant from the /tenants/{tenant_id} prefix, then the tenant header."""
+    # Set by tenant_path only once the path parameter has passed validation
+    tenant_id = getattr(request.state, "tenant_id", None) or tenant_header
+    tenant = tenant_registry.get(tenant_id)
+    if tenant is None:
+        raise HTTPException(status_code=404, detail=f"Unknown tenant: {tenant_id}")
+    return tenant
+
+
+@tenant_router.post("/bpo-acceptor-lead", response_model=LeadResponse)
+async def submit_lead(lead: LeadRequest, tenant: TenantProfile = Depends(get_tenant)):
     """
     Submit a new BPO lead and send notification email.
     
@@ -17,7 +55,8 @@ async def submit_lead(lead: LeadRequest):
     - **email**: Lead's email address (required)
     - **message**: Message from the lead (required)
     """
-    result = await email_service.send_lead_notification(lead)
+    _ensure_accepting()
+    result = await email_service.send_lead_notification(lead, tenant=tenant)
     
     if not result["success"]:
         raise HTTPException(status_code=500, detail=result["message"])
@@ -70,14 +109,15 @@ async def submit_lead(lead: LeadRequest):
 #         raise HTTPException(status_code=500, detail=f"Error processing webhook: {str(e)}")
 
 
-@router.post("/webhook/brevo-contact", response_model=LeadResponse)
-async def brevo_contact_webhook(contact: BrevoContactWebhook):
+@tenant_router.post("/webhook/brevo-contact", response_model=LeadResponse)
+async def brevo_contact_webhook(contact: BrevoContactWebhook, tenant: TenantProfile = Depends(get_tenant)):
     """
     Receive contact data from Brevo automation and send email notification.
     
     Brevo sends payload with contact attributes in nested 'attributes' object.
     This endpoint extracts FIRSTNAME and MESSAGE, then sends email to configured recipients.
     """
+    _ensure_accepting()
     try:
         logger.info(f"Received contact webhook from Brevo: {contact.email}")
         logger.info(f"Payload: {contact.model_dump()}")
@@ -95,7 +135,7 @@ async def brevo_contact_webhook(contact: BrevoContactWebhook):
         )
         
         # Send email notification with firstname and lastname
-        result = await email_service.send_lead_notification(lead, firstname, lastname)
+        result = await email_service.send_lead_notification(lead, firstname, lastname, contact.attributes, tenant)
         
         if not result["success"]:
             raise HTTPException(status_code=500, detail=result["message"])
@@ -126,6 +166,7 @@ async def brevo_webhook(event: BrevoWebhookEvent, request: Request):
     Configure this webhook URL in your Brevo dashboard:
     Settings → Webhooks → Add webhook → Enter your domain/webhook/brevo
     """
+    _ensure_accepting()
     try:
         logger.info(f"Received webhook event: {event.event} for {event.email}")
         
@@ -0,0 +1,202 @@
+import itertools
+import json
+import logging
+import os
+import re
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from pydantic import ValidationError
+
+from app.config import settings
+from app.models import LeadRequest, RoutingRule, RoutingRuleSet
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+WORD_PATTERN = re.compile(r"\w+")
+
+
+class CompiledRules:
+    """
+    Rule set compiled into indexes so a lead is matched in one pass.
+
+    Keywords, domains and attribute values are looked up in dicts, so the cost
+    per lead depends on the message length rather than the number of rules.
+    Keywords match whole words, case-insensitively. Rules are evaluated in
+    file order and the first rule whose conditions all hold wins.
+    """
+
+    def __init__(self, rules: Iterable[RoutingRule]):
+        self.rules: List[RoutingRule] = list(rules)
+        self._cycles = [
+            itertools.cycle(rule.recipients) if rule.strategy == "round_robin" else None
+            for rule in self.rules
+        ]
+
+        # Rules without any condition act as catch-alls
+        self._catch_all = next(
+            (i for i, rule in enumerate(self.rules)
+             if not (rule.keywords or rule.domains or rule.attributes)),
+            None
+        )
+
+        # Keyword index: keyword word sequence -> rule indexes
+        self._keyword_index: Dict[tuple, Set[int]] = defaultdict(set)
+        for i, rule in enumerate(self.rules):
+            for keyword in rule.keywords:
+                words = tuple(WORD_PATTERN.findall(keyword.lower()))
+                if words:
+                    self._keyword_index[words].add(i)
+        self._max_keyword_words = max((len(words) for words in self._keyword_index), default=0)
+
+        # Domain index: domain -> rule indexes
+        self._domain_index: Dict[str, Set[int]] = defaultdict(set)
+        for i, rule in enumerate(self.rules):
+            for domain in rule.domains:
+                self._domain_index[domain.lower().lstrip("@")].add(i)
+
+        # Attribute index: (attribute, value) -> rule indexes
+        self._attribute_index: Dict[tuple, Set[int]] = defaultdict(set)
+        self._attribute_keys: List[Set[str]] = []
+        for i, rule in enumerate(self.rules):
+            for key, value in rule.attributes.items():
+                self._attribute_index[(key.upper(), str(value).lower())].add(i)
+            self._attribute_keys.append({key.upper() for key in rule.attributes})
+
+    def match(self, lead: LeadRequest, attributes: Optional[Dict[str, Any]] = None) -> Optional[int]:
+        """Return the index of the first rule matching the lead, or None."""
+        # Look up every run of up to max_keyword_words words in the message
+        keyword_hits: Set[int] = set()
+        if self._keyword_index:
+            words = tuple(WORD_PATTERN.findall(lead.message.lower()))
+            lookup = self._keyword_index.get
+            for size in range(1, self._max_keyword_words + 1):
+                for start in range(len(words) - size + 1):
+                    hits = lookup(words[start:start + size])
+                    if hits:
+                        keyword_hits |= hits
+
+        # Check the sender domain and every parent domain
+        domain_hits: Set[int] = set()
+        if self._domain_index:
+            domain = lead.email.rsplit("@", 1)[-1].lower()
+            while domain:
+                domain_hits |= self._domain_index.get(domain, set())
+                domain = domain.partition(".")[2]
+
+        # Collect matched attribute keys per rule, so case-variant duplicates count once
+        attribute_hits: Dict[int, Set[str]] = defaultdict(set)
+        if attributes and self._attribute_index:
+            for key, value in attributes.items():
+                key = key.upper()
+                for i in self._attribute_index.get((key, str(value).lower()), ()):
+                    attribute_hits[i].add(key)
+
+        candidates = keyword_hits | domain_hits | attribute_hits.keys()
+        for i in sorted(candidates):
+            if self._catch_all is not None and i > self._catch_all:
+                break
+            rule = self.rules[i]
+            if rule.keywords and i not in keyword_hits:
+                continue
+            if rule.domains and i not in domain_hits:
+                continue
+            if rule.attributes and attribute_hits.get(i) != self._attribute_keys[i]:
+                continue
+            return i
+
+        return self._catch_all
+
+    def recipients_for(self, index: int) -> List[str]:
+        """Return the recipients of a matched rule, rotating for round robin."""
+        cycle = self._cycles[index]
+        if cycle is not None:
+            return [next(cycle)]
+        return list(self.rules[index].recipients)
+
+
+class RecipientRouter:
+    """Routes leads to recipients using rules loaded from a JSON rules file."""
+
+    def __init__(
+        self,
+        rules_file: Optional[str] = None,
+        reload_interval: float = 5.0,
+        default_recipients: Optional[List[str]] = None
+    ):
+        self.rules_file = rules_file
+        self.reload_interval = reload_interval
+        self.default_recipients = default_recipients or settings.get_recipient_list()
+        self._compiled = CompiledRules([])
+        self._mtime: Optional[float] = None
+        self._last_check = 0.0
+
+        if self.rules_file:
+            self.reload()
+
+    def reload(self) -> bool:
+        """
+        Load and compile the rules file, replacing the active rule set.
+
+        The previous rule set stays active if the file cannot be read or is invalid.
+
+        Returns:
+            bool: True if a new rule set was loaded
+        """
+        self._last_check = time.monotonic()
+        try:
+            # Remember the version even if it is invalid so it is not retried until edited
+            self._mtime = os.path.getmtime(self.rules_file)
+            with open(self.rules_file, encoding="utf-8") as f:
+                data = json.load(f)
+            rules = RoutingRuleSet.model_validate(data).rules
+        except (OSError, ValueError, ValidationError) as e:
+            logger.error(f"Failed to load routing rules from {self.rules_file}: {str(e)}")
+            return False
+
+        self._compiled = CompiledRules(rules)
+        logger.info(f"Loaded {len(rules)} routing rules from {self.rules_file}")
+        return True
+
+    def _reload_if_changed(self):
+        """Reload the rules file if it changed since the last check."""
+        now = time.monotonic()
+        if now - self._last_check < self.reload_interval:
+            return
+        self._last_check = now
+        try:
+            mtime = os.path.getmtime(self.rules_file)
+        except OSError:
+            return
+        if mtime != self._mtime:
+            self.reload()
+
+    def resolve(self, lead: LeadRequest, attributes: Optional[Dict[str, Any]] = None) -> List[str]:
+        """
+        Resolve the recipients for a lead.
+
+        Args:
+            lead: Lead information
+            attributes: Brevo contact attributes (optional)
+
+        Returns:
+            list: Recipient emails, the default recipients if no rule matches
+        """
+        if not self.rules_file:
+            return self.default_recipients
+
+        self._reload_if_changed()
+        compiled = self._compiled
+        index = compiled.match(lead, attributes)
+        if index is None:
+            return self.default_recipients
+
+        logger.info(f"Lead from {lead.email} matched routing rule: {compiled.rules[index].name}")
+        return compiled.recipients_for(index)
+
+
+# Create a global recipient router instance
+recipient_router = RecipientRouter(settings.ROUTING_RULES_FILE, settings.ROUTING_RELOAD_INTERVAL)
@@ -0,0 +1,169 @@
+import json
+import logging
+from collections import OrderedDict
+from string import Template
+from typing import Any, Dict, List, Optional
+
+import sib_api_v3_sdk
+
+from app.config import settings
+from app.models import LeadRequest, TenantProfile
+from app.routing import RecipientRouter, recipient_router
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_TENANT_ID = "default"
+
+DEFAULT_TEMPLATE = Template("""
+            <html>
+                <body style="font-family: Arial, sans-serif; line-height: 1.8; color: #333; max-width: 600px; margin: 0 auto; padding: 20px;">
+                    <h2 style="color: #2c3e50; font-size: 24px; margin-bottom: 20px;">Greetings!</h2>
+
+                    <p style="font-size: 16px; margin-bottom: 20px;">
+                        A new contact has been registered in the BPO <span style="background-color: #c8e6c9; padding: 2px 4px;">Acceptor</span> website. Below are the details:
+                    </p>
+
+                    <div style="background-color: #f8f9fa; padding: 20px; border-radius: 5px; margin: 20px 0;">
+                        <p style="margin: 10px 0; font-size: 16px;"><strong>Name :</strong> ${display_name}</p>
+                        <p style="margin: 10px 0; font-size: 16px;"><strong>Email Address :</strong> ${email}</p>
+                        <p style="margin: 10px 0; font-size: 16px;"><strong>Message :</strong> ${message}</p>
+                    </div>
+
+                    <div style="margin-top: 30px; font-size: 16px;">
+                        <p style="margin: 5px 0;">Best Regards,</p>
+                        <p style="margin: 5px 0; font-weight: bold;">Rachel Roy</p>
+                        <p style="margin: 5px 0;">Business Development Executive</p>
+                        <p style="margin: 5px 0;"><a href="http://www.bpoacceptor.com" style="color: #2c3e50; text-decoration: none;">www.bpoacceptor.com</a></p>
+                    </div>
+                </body>
+            </html>
+            """)
+
+# Unbranded template for tenants without a template_file
+TENANT_TEMPLATE = Template("""
+            <html>
+                <body style="font-family: Arial, sans-serif; line-height: 1.8; color: #333; max-width: 600px; margin: 0 auto; padding: 20px;">
+                    <h2 style="color: #2c3e50; font-size: 24px; margin-bottom: 20px;">Greetings!</h2>
+
+                    <p style="font-size: 16px; margin-bottom: 20px;">
+                        A new contact has been registered with ${sender_name}. Below are the details:
+                    </p>
+
+                    <div style="background-color: #f8f9fa; padding: 20px; border-radius: 5px; margin: 20px 0;">
+                        <p style="margin: 10px 0; font-size: 16px;"><strong>Name :</strong> ${display_name}</p>
+                        <p style="margin: 10px 0; font-size: 16px;"><strong>Email Address :</strong> ${email}</p>
+                        <p style="margin: 10px 0; font-size: 16px;"><strong>Message :</strong> ${message}</p>
+                    </div>
+
+                    <div style="margin-top: 30px; font-size: 16px;">
+                        <p style="margin: 5px 0;">Best Regards,</p>
+                        <p style="margin: 5px 0; font-weight: bold;">${sender_name}</p>
+                        <p style="margin: 5px 0;"><a href="mailto:${sender_email}" style="color: #2c3e50; text-decoration: none;">${sender_email}</a></p>
+                    </div>
+                </body>
+            </html>
+            """)
+
+
+class TenantRegistry:
+    """
+    Tenant profiles and their Brevo API clients.
+
+    The default tenant comes from the environment settings, others from
+    TENANTS_FILE. API clients are built on first use and kept in an LRU cache,
+    so idle tenants don't hold connection pools open.
+    """
+
+    def __init__(self, tenants_file: Optional[str] = None, client_cache_size: int = 32):
+        self.client_cache_size = max(client_cache_size, 1)
+        self._clients: "OrderedDict[str, sib_api_v3_sdk.TransactionalEmailsApi]" = OrderedDict()
+        self._templates: Dict[str, Template] = {DEFAULT_TENANT_ID: DEFAULT_TEMPLATE}
+        self._routers: Dict[str, RecipientRouter] = {DEFAULT_TENANT_ID: recipient_router}
+        self.profiles: Dict[str, TenantProfile] = {
+            DEFAULT_TENANT_ID: TenantProfile(
+                id=DEFAULT_TENANT_ID,
+                api_key=settings.BREVO_API_KEY,
+                sender_email=settings.BREVO_SENDER_EMAIL,
+                sender_name=settings.BREVO_SENDER_NAME,
+                recipients=settings.get_recipient_list(),
+                subject="New Contact Registration - BPO Acceptor",
+                routing_rules_file=settings.ROUTING_RULES_FILE
+            )
+        }
+
+        if tenants_file:
+            self._load(tenants_file)
+
+    def _load(self, tenants_file: str):
+        """Load tenant profiles and their templates from the tenants file."""
+        with open(tenants_file, encoding="utf-8") as f:
+            data = json.load(f)
+
+        for entry in data.get("tenants", []):
+            profile = TenantProfile(**entry)
+            if profile.id in self.profiles:
+                raise ValueError(f"Duplicate tenant ID in {tenants_file}: {profile.id}")
+
+            if profile.template_file:
+                with open(profile.template_file, encoding="utf-8") as f:
+                    self._templates[profile.id] = Template(f.read())
+            else:
+                self._templates[profile.id] = TENANT_TEMPLATE
+
+            if profile.routing_rules_file:
+                self._routers[profile.id] = RecipientRouter(
+                    profile.routing_rules_file,
+                    settings.ROUTING_RELOAD_INTERVAL,
+                    profile.recipients
+                )
+
+            self.profiles[profile.id] = profile
+
+        logger.info(f"Loaded {len(self.profiles) - 1} tenant profiles from {tenants_file}")
+
+    def get(self, tenant_id: Optional[str] = None) -> Optional[TenantProfile]:
+        """Return the profile for a tenant ID (the default tenant if None), or None if unknown."""
+        return self.profiles.get(tenant_id or DEFAULT_TENANT_ID)
+
+    def get_api(self, profile: TenantProfile) -> sib_api_v3_sdk.TransactionalEmailsApi:
+        """Return the cached API client for a tenant, building it on first use."""
+        api_instance = self._clients.get(profile.id)
+        if api_instance is not None:
+            self._clients.move_to_end(profile.id)
+            return api_instance
+
+        # Configure API key authorization
+        configuration = sib_api_v3_sdk.Configuration()
+        configuration.api_key['api-key'] = profile.api_key
+        api_instance = sib_api_v3_sdk.TransactionalEmailsApi(sib_api_v3_sdk.ApiClient(configuration))
+        self._clients[profile.id] = api_instance
+
+        while len(self._clients) > self.client_cache_size:
+            evicted_id, evicted = self._clients.popitem(last=False)
+            # Idle connections close now, in-flight requests finish on their own
+            evicted.api_client.rest_client.pool_manager.clear()
+            logger.info(f"Evicted Brevo API client for tenant: {evicted_id}")
+
+        return api_instance
+
+    def get_template(self, profile: TenantProfile) -> Template:
+        """Return the notification template for a tenant."""
+        return self._templates.get(profile.id, TENANT_TEMPLATE)
+
+    def resolve_recipients(
+        self,
+        profile: TenantProfile,
+        lead: LeadRequest,
+        attributes: Optional[Dict[str, Any]] = None
+    ) -> List[str]:
+        """Resolve recipients with the tenant's routing rules, or its default recipients."""
+        router = self._routers.get(profile.id)
+        if router is None:
+            return list(profile.recipients)
+        return router.resolve(lead, attributes)
+
+
+# Create a global tenant registry instance
+tenant_registry = TenantRegistry(settings.TENANTS_FILE, settings.TENANT_CLIENT_CACHE_SIZE)
@@ -0,0 +1,77 @@
+import os
+import random
+import time
+
+# Placeholder settings so the app modules can be imported without a .env
+os.environ.setdefault("BREVO_API_KEY", "benchmark")
+os.environ.setdefault("BREVO_SENDER_EMAIL", "sender@example.com")
+os.environ.setdefault("RECIPIENT_EMAILS", "default@example.com")
+
+from app.models import LeadRequest, RoutingRule
+from app.routing import CompiledRules
+
+WORDS = [
+    "bpo", "call", "center", "support", "outsourcing", "chat", "voice", "email",
+    "billing", "collections", "healthcare", "insurance", "retail", "telecom",
+    "banking", "travel", "logistics", "ecommerce", "technical", "helpdesk",
+]
+COUNTRIES = ["US", "UK", "IN", "PH", "CA", "AU"]
+
+
+def build_rules(count: int) -> list:
+    """Build a synthetic rule set mixing keyword, domain and attribute rules."""
+    rules = []
+    for i in range(count):
+        kind = i % 3
+        rules.append(RoutingRule(
+            name=f"rule-{i}",
+            keywords=[f"{random.choice(WORDS)} {random.choice(WORDS)}{i}", f"{random.choice(WORDS)}{i}"] if kind == 0 else [],
+            domains=[f"company{i}.com"] if kind == 1 else [],
+            attributes={"COUNTRY": random.choice(COUNTRIES), "SEGMENT": f"segment{i}"} if kind == 2 else {},
+            recipients=[f"rep{i}a@example.com", f"rep{i}b@example.com"],
+            strategy="round_robin" if i % 2 else "all",
+        ))
+    rules.append(RoutingRule(name="catch-all", recipients=["sales@example.com"]))
+    return rules
+
+
+def build_leads(count: int, rule_count: int) -> list:
+    """Build synthetic leads, some of which hit a rule."""
+    leads = []
+    for _ in range(count):
+        i = random.randrange(rule_count * 2)
+        message = " ".join(random.choice(WORDS) for _ in range(40)) + f" {random.choice(WORDS)}{i}"
+        lead = LeadRequest(name="Benchmark Lead", email=f"lead@company{i}.com", message=message)
+        attributes = {"COUNTRY": random.choice(COUNTRIES), "SEGMENT": f"segment{i}", "FIRSTNAME": "Lead"}
+        leads.append((lead, attributes))
+    return leads
+
+
+def benchmark(rule_count: int, lead_count: int = 2000):
+    """Time compiling a rule set and matching leads against it."""
+    rules = build_rules(rule_count)
+    leads = build_leads(lead_count, rule_count)
+
+    start = time.perf_counter()
+    compiled = CompiledRules(rules)
+    compile_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matched = 0
+    for lead, attributes in leads:
+        index = compiled.match(lead, attributes)
+        compiled.recipients_for(index)
+        if index != len(rules) - 1:
+            matched += 1
+    per_lead = (time.perf_counter() - start) / lead_count
+
+    print(f"{rule_count:>6} rules | compile {compile_time * 1000:8.2f} ms | "
+          f"{per_lead * 1_000_000:8.2f} µs/lead | {matched}/{lead_count} matched a rule")
+
+
+if __name__ == "__main__":
+    random.seed(42)
+    print("Routing rule evaluation benchmark")
+    print("-" * 70)
+    for rule_count in (10, 100, 1000):
+        benchmark(rule_count)
@@ -1,7 +1,20 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
-from app.routes import router
+from app.lifecycle import lifecycle
+from app.routes import router, tenant_path, tenant_router
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Restore saved work on startup, drain and save unfinished work on shutdown."""
+    lifecycle.install_signal_handlers()
+    await lifecycle.startup()
+    yield
+    await lifecycle.shutdown()
+    lifecycle.restore_signal_handlers()
+
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -9,7 +22,8 @@ app = FastAPI(
     description="A FastAPI service for BPO lead submissions with email notifications via Brevo SMTP",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -22,7 +36,14 @@ app.add_middleware(
 )
 
 # Include routers
+app.include_router(tenant_router, tags=["Leads"])
 app.include_router(router, tags=["Leads"])
+app.include_router(
+    tenant_router,
+    prefix="/tenants/{tenant_id}",
+    tags=["Tenants"],
+    dependencies=[Depends(tenant_path)]
+)
 
 
 @app.get("/")
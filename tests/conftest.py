@@ -0,0 +1,18 @@
+import os
+
+import pytest
+
+# Placeholder settings so the app modules can be imported without a .env
+os.environ.setdefault("BREVO_API_KEY", "test")
+os.environ.setdefault("BREVO_SENDER_EMAIL", "sender@example.com")
+os.environ.setdefault("RECIPIENT_EMAILS", "default@example.com")
+
+
+@pytest.fixture(autouse=True)
+def lifecycle_state_file(tmp_path, monkeypatch):
+    """Keep the app's lifespan away from a real lifecycle_state.json in the working directory."""
+    from app.lifecycle import lifecycle
+
+    state_file = tmp_path / "lifecycle_state.json"
+    monkeypatch.setattr(lifecycle, "state_file", str(state_file))
+    return state_file
@@ -0,0 +1,7 @@
+from app.config import Settings
+
+
+def test_recipient_list_skips_empty_entries():
+    settings = Settings(RECIPIENT_EMAILS="a@example.com, b@example.com,, ")
+
+    assert settings.get_recipient_list() == ["a@example.com", "b@example.com"]
@@ -0,0 +1,106 @@
+import asyncio
+import json
+import signal
+import types
+
+from sib_api_v3_sdk.rest import ApiException
+
+from app.email_service import EmailService
+from app.lifecycle import Lifecycle, lifecycle
+from app.tenants import tenant_registry
+
+
+def test_shutdown_saves_and_startup_restores(tmp_path):
+    state_file = tmp_path / "state.json"
+    restored = []
+    manager = Lifecycle(str(state_file), drain_timeout=1)
+    manager.register("jobs", flush=lambda: [{"id": 1}], restore=restored.extend)
+
+    report = asyncio.run(manager.shutdown())
+
+    assert report["flushed"] == {"jobs": 1}
+    assert manager.accepting is False
+    assert asyncio.run(manager.startup()) == {"jobs": 1}
+    assert restored == [{"id": 1}]
+    assert manager.accepting is True
+    assert not state_file.exists()
+
+
+def test_startup_keeps_items_that_failed_to_restore(tmp_path):
+    state_file = tmp_path / "state.json"
+    state_file.write_text(json.dumps({"components": {"good": [{"id": 1}], "bad": [{"id": 2}], "orphan": [{"id": 3}]}}))
+
+    def fail(items):
+        raise RuntimeError("boom")
+
+    manager = Lifecycle(str(state_file))
+    manager.register("good", restore=lambda items: None)
+    manager.register("bad", flush=lambda: [{"id": 4}], restore=fail)
+
+    assert asyncio.run(manager.startup()) == {"good": 1}
+    assert json.loads(state_file.read_text())["components"] == {"bad": [{"id": 2}], "orphan": [{"id": 3}]}
+
+    # Unrestored items survive the next shutdown alongside newly flushed ones
+    asyncio.run(manager.shutdown())
+    assert json.loads(state_file.read_text())["components"] == {"bad": [{"id": 2}, {"id": 4}], "orphan": [{"id": 3}]}
+
+
+def test_backlog_skips_invalid_jobs(monkeypatch):
+    sent = []
+
+    def send_transac_email(email):
+        sent.append(email.to[0].email)
+        return types.SimpleNamespace(message_id="test")
+
+    monkeypatch.setattr(tenant_registry, "get_api", lambda profile: types.SimpleNamespace(send_transac_email=send_transac_email))
+    monkeypatch.setattr(lifecycle, "accepting", True)
+    service = EmailService()
+
+    async def run():
+        service.restore_pending([
+            {"lead": {"name": "Broken"}},
+            {"firstname": "No lead"},
+            {"lead": {"name": "Jo", "email": "jo@example.com", "message": "Hi"}, "tenant": "default"},
+        ])
+        await asyncio.gather(*lifecycle._in_flight)
+
+    asyncio.run(run())
+
+    assert sent == ["default@example.com"]
+    assert service.flush_pending() == []
+
+
+def test_backlog_keeps_failed_sends(monkeypatch):
+    errors = [ApiException(status=500, reason="Server Error"), ConnectionError("network down")]
+
+    def send_transac_email(email):
+        raise errors.pop(0)
+
+    monkeypatch.setattr(tenant_registry, "get_api", lambda profile: types.SimpleNamespace(send_transac_email=send_transac_email))
+    monkeypatch.setattr(lifecycle, "accepting", True)
+    service = EmailService()
+    jobs = [
+        {"lead": {"name": "Jo", "email": "jo@example.com", "message": "Hi"}, "tenant": "default"},
+        {"lead": {"name": "Al", "email": "al@example.com", "message": "Hi"}, "tenant": "default"},
+        {"lead": {"name": "Mo", "email": "mo@example.com", "message": "Hi"}, "tenant": "removed"},
+    ]
+
+    async def run():
+        service.restore_pending([dict(job) for job in jobs])
+        await asyncio.gather(*lifecycle._in_flight)
+
+    asyncio.run(run())
+
+    assert errors == []
+    assert service.flush_pending() == jobs
+
+
+def test_signal_stops_accepting_and_calls_previous_handler(tmp_path):
+    received = []
+    manager = Lifecycle(str(tmp_path / "state.json"))
+    manager._previous_handlers = {signal.SIGTERM: lambda sig, frame: received.append(sig)}
+
+    manager._handle_signal(signal.SIGTERM, None)
+
+    assert manager.accepting is False
+    assert received == [signal.SIGTERM]
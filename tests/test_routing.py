@@ -0,0 +1,133 @@
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from app.models import LeadRequest, RoutingRule
+from app.routing import CompiledRules, RecipientRouter
+
+
+def make_lead(email="lead@example.com", message="Hello"):
+    return LeadRequest(name="Test Lead", email=email, message=message)
+
+
+def make_rule(name, **conditions):
+    conditions.setdefault("recipients", [f"{name}@example.com"])
+    return RoutingRule(name=name, **conditions)
+
+
+def test_first_matching_rule_wins():
+    compiled = CompiledRules([
+        make_rule("first", keywords=["support"]),
+        make_rule("second", keywords=["support", "billing"]),
+    ])
+
+    assert compiled.match(make_lead(message="Need support now")) == 0
+    assert compiled.match(make_lead(message="Billing question")) == 1
+
+
+def test_no_match_returns_none():
+    compiled = CompiledRules([make_rule("support", keywords=["support"])])
+
+    assert compiled.match(make_lead(message="Just saying hi")) is None
+
+
+def test_catch_all_stops_later_rules():
+    compiled = CompiledRules([
+        make_rule("support", keywords=["support"]),
+        make_rule("catch-all"),
+        make_rule("billing", keywords=["billing"]),
+    ])
+
+    assert compiled.match(make_lead(message="Need support")) == 0
+    assert compiled.match(make_lead(message="Billing question")) == 1
+    assert compiled.match(make_lead(message="Hello")) == 1
+
+
+def test_keywords_match_whole_words_case_insensitively():
+    compiled = CompiledRules([make_rule("call-center", keywords=["Call Center"])])
+
+    assert compiled.match(make_lead(message="We run a CALL   center in Manila")) == 0
+    assert compiled.match(make_lead(message="Please call me")) is None
+    assert compiled.match(make_lead(message="A recall centered plan")) is None
+
+
+def test_overlapping_keywords_match_all_rules():
+    compiled = CompiledRules([
+        make_rule("short", keywords=["call"], domains=["acme.com"]),
+        make_rule("long", keywords=["call center"]),
+    ])
+
+    assert compiled.match(make_lead(email="a@acme.com", message="Our call center")) == 0
+    assert compiled.match(make_lead(email="a@globex.com", message="Our call center")) == 1
+
+
+@pytest.mark.parametrize("keyword", ["C++", ".NET", "C#", "don't", "---", ""])
+def test_keywords_with_punctuation_are_rejected(keyword):
+    with pytest.raises(ValidationError):
+        make_rule("bad", keywords=[keyword])
+
+
+def test_hyphenated_keywords_match_as_separate_words():
+    compiled = CompiledRules([make_rule("ecommerce", keywords=["e-commerce"])])
+
+    assert compiled.match(make_lead(message="An e-commerce store")) == 0
+    assert compiled.match(make_lead(message="An e commerce store")) == 0
+    assert compiled.match(make_lead(message="Commerce only")) is None
+
+
+def test_domains_match_subdomains():
+    compiled = CompiledRules([make_rule("acme", domains=["acme.com"])])
+
+    assert compiled.match(make_lead(email="a@acme.com")) == 0
+    assert compiled.match(make_lead(email="a@sales.eu.acme.com")) == 0
+    assert compiled.match(make_lead(email="a@notacme.com")) is None
+
+
+def test_attributes_require_all_keys():
+    compiled = CompiledRules([make_rule("us-enterprise", attributes={"COUNTRY": "US", "SEGMENT": "enterprise"})])
+    lead = make_lead()
+
+    assert compiled.match(lead, {"country": "us", "Segment": "Enterprise", "FIRSTNAME": "Jo"}) == 0
+    assert compiled.match(lead, {"COUNTRY": "US"}) is None
+    assert compiled.match(lead, {"COUNTRY": "US", "country": "us"}) is None
+    assert compiled.match(lead) is None
+
+
+def test_conditions_are_combined_with_and():
+    compiled = CompiledRules([make_rule("acme-support", keywords=["support"], domains=["acme.com"])])
+
+    assert compiled.match(make_lead(email="a@acme.com", message="support")) == 0
+    assert compiled.match(make_lead(email="a@globex.com", message="support")) is None
+    assert compiled.match(make_lead(email="a@acme.com", message="hello")) is None
+
+
+def test_round_robin_rotates_recipients():
+    compiled = CompiledRules([
+        make_rule("reps", recipients=["rep1@example.com", "rep2@example.com"], strategy="round_robin"),
+        make_rule("team", recipients=["a@example.com", "b@example.com"]),
+    ])
+
+    assert [compiled.recipients_for(0) for _ in range(3)] == [
+        ["rep1@example.com"], ["rep2@example.com"], ["rep1@example.com"]
+    ]
+    assert compiled.recipients_for(1) == ["a@example.com", "b@example.com"]
+
+
+def test_router_keeps_previous_rules_on_invalid_file(tmp_path):
+    rules_file = tmp_path / "rules.json"
+    rules_file.write_text(json.dumps({"rules": [{"name": "all", "recipients": ["all@example.com"]}]}))
+    router = RecipientRouter(str(rules_file), reload_interval=0, default_recipients=["default@example.com"])
+
+    assert router.resolve(make_lead()) == ["all@example.com"]
+
+    for invalid in ("{bad", "[1]", '{"rules": [1]}'):
+        rules_file.write_text(invalid)
+        assert router.reload() is False
+        assert router.resolve(make_lead()) == ["all@example.com"]
+
+
+def test_router_without_rules_file_uses_default_recipients():
+    router = RecipientRouter(default_recipients=["default@example.com"])
+
+    assert router.resolve(make_lead()) == ["default@example.com"]
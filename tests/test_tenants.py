@@ -0,0 +1,114 @@
+import json
+import types
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from app.tenants import TenantRegistry, tenant_registry
+
+ACME = {
+    "id": "acme",
+    "api_key": "acme-key",
+    "sender_email": "leads@acme.com",
+    "sender_name": "Acme",
+    "recipients": ["sales@acme.com"],
+    "subject": "Acme lead"
+}
+LEAD = {"name": "Jo", "email": "jo@example.com", "message": "Hi"}
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    """Record emails instead of sending them, with an acme tenant registered."""
+    emails = []
+
+    def get_api(profile):
+        def send_transac_email(email):
+            emails.append((profile.id, email.sender.name, [to.email for to in email.to], email.subject))
+            return types.SimpleNamespace(message_id="test")
+        return types.SimpleNamespace(send_transac_email=send_transac_email)
+
+    monkeypatch.setattr(tenant_registry, "get_api", get_api)
+    monkeypatch.setitem(tenant_registry.profiles, "acme", tenant_registry.profiles["default"].model_copy(update=ACME))
+    return emails
+
+
+def test_tenant_selected_by_prefix_header_or_default(sent):
+    with TestClient(main.app) as client:
+        assert client.post("/tenants/acme/bpo-acceptor-lead", json=LEAD).status_code == 200
+        assert client.post("/bpo-acceptor-lead", json=LEAD, headers={"X-Tenant-ID": "acme"}).status_code == 200
+        assert client.post("/bpo-acceptor-lead", json=LEAD).status_code == 200
+
+    assert sent == [
+        ("acme", "Acme", ["sales@acme.com"], "Acme lead"),
+        ("acme", "Acme", ["sales@acme.com"], "Acme lead"),
+        ("default", "BPO Acceptor", ["default@example.com"], "New Contact Registration - BPO Acceptor"),
+    ]
+
+
+@pytest.mark.parametrize("method, path", [
+    ("post", "/tenants/unknown/bpo-acceptor-lead"),
+    ("post", "/tenants/unknown/webhook/brevo-contact"),
+    ("post", "/tenants/unknown/webhook/brevo"),
+    ("get", "/tenants/unknown/health"),
+])
+def test_unknown_tenant_returns_404(sent, method, path):
+    with TestClient(main.app) as client:
+        if method == "post":
+            response = client.post(path, json={"attributes": {}, **LEAD})
+        else:
+            response = client.get(path)
+
+    assert response.status_code == 404
+    assert sent == []
+
+
+def test_api_clients_are_evicted_least_recently_used(tmp_path):
+    tenants_file = tmp_path / "tenants.json"
+    tenants_file.write_text(json.dumps({"tenants": [ACME, {**ACME, "id": "globex", "api_key": "globex-key"}]}))
+    registry = TenantRegistry(str(tenants_file), client_cache_size=2)
+    acme, globex, default = registry.get("acme"), registry.get("globex"), registry.get()
+
+    acme_api = registry.get_api(acme)
+    registry.get_api(globex)
+    assert registry.get_api(acme) is acme_api
+
+    registry.get_api(default)
+    assert list(registry._clients) == ["acme", "default"]
+    assert registry.get_api(acme) is acme_api
+    assert acme_api.api_client.configuration.api_key["api-key"] == "acme-key"
+
+
+def test_example_tenants_are_not_bpo_acceptor_branded(monkeypatch):
+    # Template paths in the example are relative to the project root
+    monkeypatch.chdir(Path(__file__).parent.parent)
+    registry = TenantRegistry("tenants.example.json")
+
+    for tenant_id in ("acme", "globex"):
+        profile = registry.get(tenant_id)
+        html = registry.get_template(profile).safe_substitute(
+            display_name="Jo",
+            email="jo@example.com",
+            message="Hi",
+            sender_name=profile.sender_name,
+            sender_email=profile.sender_email
+        )
+        assert profile.sender_name in html
+        assert "Jo" in html
+        assert "BPO" not in html and "Rachel Roy" not in html and "bpoacceptor" not in html
+
+
+def test_tenant_parameters_are_documented_and_validated(sent):
+    paths = main.app.openapi()["paths"]
+
+    def parameters(path):
+        return {(p["name"], p["in"]) for p in paths[path]["post"].get("parameters", [])}
+
+    assert parameters("/tenants/{tenant_id}/bpo-acceptor-lead") == {("tenant_id", "path"), ("X-Tenant-ID", "header")}
+    assert parameters("/bpo-acceptor-lead") == {("X-Tenant-ID", "header")}
+
+    with TestClient(main.app) as client:
+        assert client.post("/tenants/not.valid/bpo-acceptor-lead", json=LEAD).status_code == 422
+    assert sent == []